@@ -1,18 +1,58 @@
 import os
-import pandas as pd
+import io
+import re
+import csv
+import math
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv
 import argparse
 
+# '#' comment lines anywhere in IUPred3 output
+IUPRED_COMMENT_LINE_RE = re.compile(rb"(?m)^[ \t]*#[^\n]*(?:\n|$)")
+
+# IUPred3 output is tab-separated with no header row: POS, RES, IUPRED2
+IUPRED_READ_OPTIONS = pacsv.ReadOptions(column_names=["position", "residue", "disorder_score"])
+IUPRED_PARSE_OPTIONS = pacsv.ParseOptions(delimiter="\t")
+IUPRED_CONVERT_OPTIONS = pacsv.ConvertOptions(
+    include_columns=["disorder_score"],
+    column_types={"disorder_score": pa.float64()}
+)
+
+# Summary columns; both metrics lie in [0, 1], so float32 is plenty for Parquet output
+SUMMARY_COLUMNS = ["filename", "median_disorder", "fraction_disordered"]
+SUMMARY_SCHEMA = pa.schema([
+    ("filename", pa.string()),
+    ("median_disorder", pa.float32()),
+    ("fraction_disordered", pa.float32())
+])
+PARQUET_BATCH_SIZE = 10000
+
 def process_iupred_csv(csv_file):
     """
     Reads an IUPred3 CSV file and calculates median disorder and fraction of disorder-promoting residues.
     """
     try:
-        # Load CSV, assuming it has headers: POS, RES, IUPRED2
-        df = pd.read_csv(csv_file, sep="\t", comment="#", header=None, names=["position", "residue", "disorder_score"])
+        # Strip all '#' comment lines in one pass (pyarrow has no comment option)
+        with open(csv_file, "rb") as f:
+            data = IUPRED_COMMENT_LINE_RE.sub(b"", f.read())
+
+        # Empty or comment-only output (e.g. a failed iupred3.py run) gives NaN statistics
+        if not data.strip():
+            return np.nan, np.nan
+
+        table = pacsv.read_csv(
+            io.BytesIO(data),
+            read_options=IUPRED_READ_OPTIONS,
+            parse_options=IUPRED_PARSE_OPTIONS,
+            convert_options=IUPRED_CONVERT_OPTIONS
+        )
+        scores = table.column("disorder_score").to_numpy(zero_copy_only=False)
 
         # Compute statistics
-        median_disorder = df["disorder_score"].median()
-        fraction_disordered = (df["disorder_score"] >= 0.5).mean()
+        median_disorder = np.median(scores)
+        fraction_disordered = np.count_nonzero(scores >= 0.5) / scores.size
 
         return median_disorder, fraction_disordered
     except Exception as e:
@@ -20,24 +60,58 @@ def process_iupred_csv(csv_file):
         return None, None
 
 
-def aggregate_results(input_dir, output_file):
+def iter_summaries(input_dir, skip_path=None):
     """
-    Processes all CSV files in input_dir and saves results to output_file.
+    Yields (filename, median_disorder, fraction_disordered) for every CSV file in input_dir.
+    """
+    with os.scandir(input_dir) as entries:
+        for entry in entries:
+            # Skip the summary itself in case it is being written into input_dir
+            if entry.name.endswith(".csv") and entry.is_file() and os.path.abspath(entry.path) != skip_path:
+                filename_without_extension = os.path.splitext(entry.name)[0]
+
+                median_disorder, fraction_disordered = process_iupred_csv(entry.path)
+                if median_disorder is not None:
+                    yield filename_without_extension, median_disorder, fraction_disordered
+
+
+def write_parquet_batch(writer, rows):
+    """
+    Writes a list of summary rows to an open ParquetWriter as one float32 row group.
     """
-    results = []
+    filenames, medians, fractions = zip(*rows)
+    writer.write_table(pa.table({
+        "filename": list(filenames),
+        "median_disorder": np.array(medians).astype(np.float32),
+        "fraction_disordered": np.array(fractions).astype(np.float32)
+    }, schema=SUMMARY_SCHEMA))
 
-    for csv_file in os.listdir(input_dir):
-        if csv_file.endswith(".csv"):
-            file_path = os.path.join(input_dir, csv_file)
-            filename_without_extension = os.path.splitext(csv_file)[0]
 
-            median_disorder, fraction_disordered = process_iupred_csv(file_path)
-            if median_disorder is not None:
-                results.append([filename_without_extension, median_disorder, fraction_disordered])
+def aggregate_results(input_dir, output_file):
+    """
+    Processes all CSV files in input_dir and saves results to output_file.
+    Writes Parquet if output_file ends in .parquet, otherwise CSV.
+    Rows are written as files are processed, so memory use does not grow with the number of files.
+    """
+    summaries = iter_summaries(input_dir, skip_path=os.path.abspath(output_file))
 
-    # Save to CSV
-    df_results = pd.DataFrame(results, columns=["filename", "median_disorder", "fraction_disordered"])
-    df_results.to_csv(output_file, index=False)
+    if output_file.endswith(".parquet"):
+        with pq.ParquetWriter(output_file, SUMMARY_SCHEMA) as writer:
+            batch = []
+            for row in summaries:
+                batch.append(row)
+                if len(batch) == PARQUET_BATCH_SIZE:
+                    write_parquet_batch(writer, batch)
+                    batch = []
+            if batch:
+                write_parquet_batch(writer, batch)
+    else:
+        with open(output_file, "w", newline="") as out:
+            writer = csv.writer(out)
+            writer.writerow(SUMMARY_COLUMNS)
+            # Missing values are written as empty fields
+            writer.writerows(['' if isinstance(v, float) and math.isnan(v) else v for v in row]
+                             for row in summaries)
 
     print(f"Summary saved to {output_file}")
 
@@ -45,7 +119,7 @@ def aggregate_results(input_dir, output_file):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Aggregate IUPred3 disorder results.")
     parser.add_argument("input_dir", help="Directory containing IUPred3 CSV files")
-    parser.add_argument("output_file", help="Path to output CSV file")
+    parser.add_argument("output_file", help="Path to output CSV file (use a .parquet suffix for Parquet output)")
 
     args = parser.parse_args()
     aggregate_results(args.input_dir, args.output_file)
@@ -1,8 +1,12 @@
 import os
-import pandas as pd
+import io
+import csv
+import math
 import numpy as np
-from Bio.PDB import PDBParser
+import biotite.structure.io.pdb as pdb
+from numba import njit
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # ------------- CONFIGURABLE PATHS -------------
@@ -11,35 +15,64 @@ stride_executable = "path/to/stride_executable"  # Path to your STRIDE executabl
 output_csv = "structure_analysis_results.csv"    # Output CSV file
 # ----------------------------------------------
 
-# Initialize PDB parser (supresses warnings)
-parser = PDBParser(QUIET=True)
+# STRIDE secondary structure codes, in output column order
+SS_CODES = "HGIEBTCS"
 
-def calculate_average_plddt(pdb_file):
+
+def calculate_average_plddt(pdb_file, pdb_data=None):
     """
-    Calculates the mean pLDDT of all atoms in a PDB file.
+    Calculates the mean pLDDT of all atoms in the first model of a PDB file.
     pLDDT scores are assumed to be stored in the B-factor field.
+    Only model 1 is used; for multi-model files this differs from averaging over all models.
+    pdb_data optionally holds the file contents already read by the caller.
     """
     try:
-        structure = parser.get_structure("structure", pdb_file)
-        # Collect all B-factors
-        b_factors = [
-            atom.bfactor
-            for model in structure
-            for chain in model
-            for residue in chain
-            for atom in residue
-        ]
-        
-        if not b_factors:
+        if pdb_data is None:
+            pdb_data = Path(pdb_file).read_bytes()
+
+        # Parse straight into a NumPy-backed AtomArray (B-factors must be requested explicitly).
+        # Biotite only parses text, so the bytes are decoded into an in-memory text buffer.
+        pdb_text = io.StringIO(pdb_data.decode('utf-8'))
+        parsed = pdb.PDBFile.read(pdb_text)
+
+        # A file without ATOM/HETATM records has zero models (get_structure would raise on it)
+        if parsed.get_model_count() == 0:
             print(f"Warning: No B-factors found in {pdb_file}")
             return np.nan
-        
-        return np.mean(b_factors)
+
+        atoms = parsed.get_structure(model=1, extra_fields=["b_factor"])
+
+        # Single vectorised reduction; accumulate in float64 since b_factor is stored as float32
+        return float(atoms.b_factor.mean(dtype=np.float64))
     except Exception as e:
         print(f"Error processing {pdb_file}: {str(e)}")
         return np.nan
 
-def get_stride_secondary_structure_counts(pdb_file):
+
+@njit(cache=True)
+def _count_stride_codes(buf):
+    """
+    Scans raw STRIDE output and counts the secondary structure code of each 'ASG' line.
+    The one-letter code sits at a fixed column (index 24) of each ASG line.
+    Counts are indexed directly by the code's byte value; only the SS_CODES slots are read back.
+    """
+    counts = np.zeros(256, dtype=np.int64)
+    n = buf.size
+    start = 0
+    while start < n:
+        # Each line describing a residue starts with 'ASG' (bytes 65, 83, 71) in STRIDE output.
+        # You may need to adjust the code column if your STRIDE version differs.
+        if (start + 24 < n and buf[start] == 65 and buf[start + 1] == 83
+                and buf[start + 2] == 71):
+            counts[buf[start + 24]] += 1
+        # Jump to the start of the next line ('\n' is byte 10)
+        while start < n and buf[start] != 10:
+            start += 1
+        start += 1
+    return counts
+
+
+def get_stride_secondary_structure_counts(pdb_file, pdb_data=None):
     """
     Runs STRIDE on a PDB file and returns a dictionary with counts
     of each secondary structure code. STRIDE typically uses:
@@ -51,39 +84,93 @@ def get_stride_secondary_structure_counts(pdb_file):
       T: Hydrogen-bonded turn
       C: Coil
       S: Bend (sometimes reported)
+    If pdb_data (the file contents) is given, it is piped to STRIDE instead of STRIDE re-reading the file.
     """
-    # Initialize all possible STRIDE codes to 0
-    ss_codes = {"H": 0, "G": 0, "I": 0, "E": 0, "B": 0, "T": 0, "C": 0, "S": 0}
-    
     try:
-        # Run STRIDE and capture its output
+        # Run STRIDE and capture its raw output (no text decoding; stderr is not used).
+        # STRIDE has no stdin option, so piped input is passed as /dev/stdin.
         stride_output = subprocess.run(
-            [stride_executable, pdb_file],
-            capture_output=True,
-            text=True,
+            [stride_executable, pdb_file if pdb_data is None else "/dev/stdin"],
+            input=pdb_data,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             check=True
         )
-        stride_data = stride_output.stdout
-        
-        # Each line describing a residue typically starts with 'ASG' in STRIDE output.
-        # The one-letter secondary structure code is usually found at a specific column (around index 24).
-        # You may need to adjust if your STRIDE version differs.
-        for line in stride_data.splitlines():
-            if line.startswith("ASG"):
-                # Extract SS code (column 25 if counting from 1, or index 24 if from 0)
-                ss_code = line[24]
-                
-                if ss_code in ss_codes:
-                    ss_codes[ss_code] += 1
-                    
-        return ss_codes
+        stride_data = np.frombuffer(stride_output.stdout, dtype=np.uint8)
+
+        # Count SS codes with the compiled byte scanner
+        counts = _count_stride_codes(stride_data)
+        return {ss_code: int(counts[ord(ss_code)]) for ss_code in SS_CODES}
 
     except subprocess.CalledProcessError as e:
         print(f"STRIDE error for {pdb_file}: {str(e)}")
-        return {k: np.nan for k in ss_codes.keys()}
+        return {k: np.nan for k in SS_CODES}
     except Exception as e:
         print(f"Error processing {pdb_file} with STRIDE: {str(e)}")
-        return {k: np.nan for k in ss_codes.keys()}
+        return {k: np.nan for k in SS_CODES}
+
+
+def process_pdb_file(pdb_file):
+    """
+    Computes the pLDDT and STRIDE counts for one PDB file.
+    Runs inside a worker process; returns None if the file could not be processed.
+    """
+    try:
+        # Read the file once and feed the same bytes to both analyses.
+        # If that fails, each analysis falls back to the path and reports NaN through its own error handling.
+        try:
+            pdb_data = pdb_file.read_bytes()
+        except OSError:
+            pdb_data = None
+
+        # Use the file stem (filename without extension) as protein ID
+        record = {
+            'protein_id': pdb_file.stem,
+            'pLDDT': calculate_average_plddt(pdb_file, pdb_data)
+        }
+        # Merge STRIDE codes into the record (e.g., 'H': #, 'G': #, etc.)
+        record.update(get_stride_secondary_structure_counts(pdb_file, pdb_data))
+        return record
+
+    except Exception as e:
+        print(f"Failed to process {pdb_file}: {str(e)}")
+        return None
+
+
+class RunningStats:
+    """
+    Streaming count/mean/std/min/max of a column (Welford's algorithm).
+    NaN values are skipped, matching pandas' describe().
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        if value is None or math.isnan(value):
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def describe(self):
+        if self.count == 0:
+            return "count    0"
+        # Sample standard deviation (ddof=1), as reported by pandas
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+        return "\n".join([
+            f"count    {self.count}",
+            f"mean     {self.mean:.6f}",
+            f"std      {std:.6f}",
+            f"min      {self.min:.6f}",
+            f"max      {self.max:.6f}",
+        ])
 
 
 def main():
@@ -92,44 +179,34 @@ def main():
     total_files = len(pdb_files)
     print(f"Found {total_files} PDB files to process in '{pdb_dir}'")
 
-    results = []
+    fieldnames = ['protein_id', 'pLDDT'] + list(SS_CODES)
+    stats = {column: RunningStats() for column in fieldnames[1:]}
     processed_files = 0
     failed_files = 0
 
-    # Process each PDB file
-    for pdb_file in pdb_files:
-        try:
-            # Use the file stem (filename without extension) as protein ID
-            protein_id = pdb_file.stem
-
-            # Calculate average pLDDT
-            plddt = calculate_average_plddt(pdb_file)
-
-            # Get secondary structure counts from STRIDE
-            ss_dict = get_stride_secondary_structure_counts(pdb_file)
-
-            # Prepare result record
-            record = {
-                'protein_id': protein_id,
-                'pLDDT': plddt
-            }
-            # Merge STRIDE codes into the record (e.g., 'H': #, 'G': #, etc.)
-            record.update(ss_dict)
-
-            results.append(record)
+    # Process the PDB files in parallel; each file is independent.
+    # Rows are written to the CSV as they arrive, so results are never all held in memory.
+    with open(output_csv, 'w', newline='') as f, \
+            ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+
+        for record in executor.map(process_pdb_file, pdb_files, chunksize=8):
+            if record is None:
+                failed_files += 1
+                continue
+
+            for column, column_stats in stats.items():
+                column_stats.add(record[column])
+            # Missing values are written as empty fields
+            writer.writerow({k: '' if isinstance(v, float) and math.isnan(v) else v
+                             for k, v in record.items()})
             processed_files += 1
 
             # Optional progress update
             if processed_files % 10 == 0:
                 print(f"Processed {processed_files}/{total_files} files...")
 
-        except Exception as e:
-            print(f"Failed to process {pdb_file}: {str(e)}")
-            failed_files += 1
-
-    # Convert results to a DataFrame
-    df = pd.DataFrame(results)
-
     # Print a brief summary
     print("\nProcessing Summary:")
     print(f"Total files processed successfully: {processed_files}")
@@ -137,17 +214,14 @@ def main():
 
     # Basic statistics on columns of interest
     print("\n--- pLDDT Stats ---")
-    print(df['pLDDT'].describe())
+    print(stats['pLDDT'].describe())
 
     print("\n--- STRIDE Secondary Structure Counts (summary) ---")
-    for ss_code in ["H", "G", "I", "E", "B", "T", "C", "S"]:
-        if ss_code in df.columns:
-            print(f"{ss_code} stats:")
-            print(df[ss_code].describe())
-            print()
-
-    # Save results to CSV
-    df.to_csv(output_csv, index=False)
+    for ss_code in SS_CODES:
+        print(f"{ss_code} stats:")
+        print(stats[ss_code].describe())
+        print()
+
     print(f"Results saved to: {output_csv}")
 
 
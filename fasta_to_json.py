@@ -9,62 +9,86 @@ Handles both single and multi-sequence FASTA files with two modes:
 import json
 import os
 import argparse
+import functools
+import multiprocessing
 import re
+import string
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+
+# Standard amino acid one-letter codes
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+
+class _CleanTable(dict):
+    """str.translate table: maps amino acids (either case) to upper case, deletes everything else."""
+    def __missing__(self, key):
+        return None
+
+
+_CLEAN_TABLE = _CleanTable(str.maketrans(AMINO_ACIDS + AMINO_ACIDS.lower(), AMINO_ACIDS * 2))
+
+# Bytes stripped from FASTA sequence bodies (same set as bytes.split() with no argument)
+_WHITESPACE = b' \t\n\r\x0b\x0c'
+
+# Start of a FASTA record: '>' at the beginning of a line, optionally preceded by spaces/tabs
+_RECORD_START_RE = re.compile(rb'(?:^|[\r\n])[^\S\r\n]*>')
+_LINE_BREAK_RE = re.compile(rb'[\r\n]')
+
+# Characters not allowed in output filenames derived from FASTA headers
+_FILENAME_RE = re.compile(r'[^\w\-_.]')
+
 
 def parse_fasta(fasta_file):
     """Parse FASTA file and return list of (header, sequence) tuples."""
+    data = Path(fasta_file).read_bytes()
+    
+    # Records start at a '>' that begins a line, after optional leading whitespace.
+    # Lines may end in '\n', '\r\n' or a bare '\r'; anything before the first record is ignored.
+    records = _RECORD_START_RE.split(data)[1:]
+    
     sequences = []
-    current_header = None
-    current_sequence = []
-    
-    with open(fasta_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith('>'):
-                if current_header is not None:
-                    sequences.append((current_header, ''.join(current_sequence)))
-                current_header = line[1:]  # Remove '>'
-                current_sequence = []
-            elif line:
-                current_sequence.append(line)
-    
-    # Add the last sequence
-    if current_header is not None:
-        sequences.append((current_header, ''.join(current_sequence)))
+    for record in records:
+        # The header runs up to the first line break
+        line_break = _LINE_BREAK_RE.search(record)
+        end = line_break.start() if line_break else len(record)
+        header, body = record[:end], record[end:]
+        # Drop line breaks (and any other whitespace) from the sequence in one C-level pass
+        sequences.append((header.rstrip().decode(), body.translate(None, _WHITESPACE).decode()))
     
     return sequences
 
 
 def clean_sequence(sequence):
     """Remove any non-amino acid characters from sequence."""
-    # Keep only standard amino acid letters
-    return re.sub(r'[^ACDEFGHIKLMNPQRSTVWY]', '', sequence.upper())
+    # Keep only standard amino acid letters (single C-level pass, no regex)
+    return sequence.translate(_CLEAN_TABLE)
 
 
+@functools.lru_cache(maxsize=None)
 def generate_chain_ids(num_sequences):
-    """Generate chain IDs for sequences (A, B, C, ..., Z, AA, AB, ...)."""
-    chain_ids = []
-    for i in range(num_sequences):
-        if i < 26:
-            chain_ids.append(chr(ord('A') + i))
-        else:
-            # For more than 26 sequences, use AA, AB, AC, etc.
-            first = chr(ord('A') + (i // 26) - 1)
-            second = chr(ord('A') + (i % 26))
-            chain_ids.append(first + second)
-    return chain_ids
+    """Generate chain IDs for sequences (A, B, C, ..., Z, AA, AB, ...). Cached per count."""
+    letters = string.ascii_uppercase
+    # For more than 26 sequences, use AA, AB, AC, etc. The first letter uses chr() arithmetic
+    # so counts past ZZ (702) still return IDs, as before, instead of raising IndexError.
+    return tuple(letters[:num_sequences]) + tuple(
+        chr(ord('A') + i // 26 - 1) + letters[i % 26] for i in range(26, num_sequences)
+    )
 
 
-def create_alphafold3_json(sequences, job_name, model_seeds=None):
-    """Create AlphaFold3 JSON input from parsed sequences."""
+def create_alphafold3_json(sequences, job_name, model_seeds=None, _precleaned=False):
+    """Create AlphaFold3 JSON input from parsed sequences.
+    
+    Set _precleaned if the sequences have already been passed through clean_sequence.
+    """
     if model_seeds is None:
         model_seeds = [1]
     
-    # Generate chain IDs
-    chain_ids = generate_chain_ids(len(sequences))
-    
     # Create the JSON structure
     af3_json = {
         "name": job_name,
@@ -77,17 +101,18 @@ def create_alphafold3_json(sequences, job_name, model_seeds=None):
     # Handle single sequence case
     if len(sequences) == 1:
         _, sequence = sequences[0]
-        cleaned_seq = clean_sequence(sequence)
+        cleaned_seq = sequence if _precleaned else clean_sequence(sequence)
         af3_json["sequences"].append({
             "protein": {
-                "id": [chain_ids[0]],
+                "id": ["A"],
                 "sequence": cleaned_seq
             }
         })
     else:
         # Handle multiple sequences (complex)
+        chain_ids = generate_chain_ids(len(sequences))
         for i, (header, sequence) in enumerate(sequences):
-            cleaned_seq = clean_sequence(sequence)
+            cleaned_seq = sequence if _precleaned else clean_sequence(sequence)
             af3_json["sequences"].append({
                 "protein": {
                     "id": [chain_ids[i]],
@@ -98,8 +123,21 @@ def create_alphafold3_json(sequences, job_name, model_seeds=None):
     return af3_json
 
 
+def write_json(data, output_file):
+    """Write data as 2-space indented JSON in a single write (uses orjson when installed)."""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode()
+    Path(output_file).write_bytes(payload)
+
+
 def process_fasta_file(fasta_file, output_dir, model_seeds=None, split_sequences=False):
-    """Process a single FASTA file and create corresponding JSON(s)."""
+    """Process a single FASTA file and create corresponding JSON(s).
+    
+    Returns (output_files, report); the report lines are left for the caller to print,
+    so parallel workers never write to stdout themselves.
+    """
     fasta_path = Path(fasta_file)
     base_job_name = fasta_path.stem  # Filename without extension
     
@@ -107,33 +145,34 @@ def process_fasta_file(fasta_file, output_dir, model_seeds=None, split_sequences
     sequences = parse_fasta(fasta_file)
     
     if not sequences:
-        print(f"Warning: No sequences found in {fasta_file}")
-        return []
+        return [], [f"Warning: No sequences found in {fasta_file}"]
     
     output_files = []
+    # Collect per-file messages for the caller to print in one go
+    report = []
     
     if split_sequences:
         # Create one JSON file per sequence
         for i, (header, sequence) in enumerate(sequences):
             # Clean up header for filename (remove problematic characters)
-            clean_header = re.sub(r'[^\w\-_.]', '_', header)
+            clean_header = _FILENAME_RE.sub('_', header)
             if len(clean_header) > 50:  # Truncate very long headers
                 clean_header = clean_header[:50]
             
             job_name = f"{base_job_name}_{i+1:03d}_{clean_header}"
             
-            # Create JSON for single sequence
-            af3_json = create_alphafold3_json([(header, sequence)], job_name, model_seeds)
+            # Create JSON for single sequence (cleaned once, reused for the length report)
+            cleaned_seq = clean_sequence(sequence)
+            af3_json = create_alphafold3_json([(header, cleaned_seq)], job_name, model_seeds, _precleaned=True)
             
             # Write JSON file
             output_file = Path(output_dir) / f"{job_name}.json"
-            with open(output_file, 'w') as f:
-                json.dump(af3_json, f, indent=2)
+            write_json(af3_json, output_file)
             
-            print(f"Created: {output_file}")
-            print(f"  - Job name: {job_name}")
-            print(f"  - Header: {header}")
-            print(f"  - Sequence length: {len(clean_sequence(sequence))}")
+            report.append(f"Created: {output_file}")
+            report.append(f"  - Job name: {job_name}")
+            report.append(f"  - Header: {header}")
+            report.append(f"  - Sequence length: {len(cleaned_seq)}")
             
             output_files.append(output_file)
     
@@ -143,17 +182,16 @@ def process_fasta_file(fasta_file, output_dir, model_seeds=None, split_sequences
         
         # Write JSON file
         output_file = Path(output_dir) / f"{base_job_name}.json"
-        with open(output_file, 'w') as f:
-            json.dump(af3_json, f, indent=2)
+        write_json(af3_json, output_file)
         
-        print(f"Created: {output_file}")
-        print(f"  - Job name: {base_job_name}")
-        print(f"  - Sequences: {len(sequences)}")
-        print(f"  - Chain IDs: {[seq['protein']['id'][0] for seq in af3_json['sequences']]}")
+        report.append(f"Created: {output_file}")
+        report.append(f"  - Job name: {base_job_name}")
+        report.append(f"  - Sequences: {len(sequences)}")
+        report.append(f"  - Chain IDs: {[seq['protein']['id'][0] for seq in af3_json['sequences']]}")
         
         output_files.append(output_file)
     
-    return output_files
+    return output_files, report
 
 
 def main():
@@ -196,24 +234,35 @@ Examples:
     
     input_path = Path(args.input)
     processed_files = []
+    extensions = tuple(ext.lower() for ext in args.extensions)
     
     if input_path.is_file():
         # Process single file
-        if input_path.suffix.lower() in [ext.lower() for ext in args.extensions]:
-            results = process_fasta_file(input_path, output_dir, args.model_seeds, args.split)
+        if input_path.name.lower().endswith(extensions):
+            results, report = process_fasta_file(input_path, output_dir, args.model_seeds, args.split)
+            print("\n".join(report))
             processed_files.extend(results)
         else:
             print(f"Warning: {input_path} does not have a recognized FASTA extension")
     
     elif input_path.is_dir():
-        # Process all FASTA files in directory
-        for ext in args.extensions:
-            pattern = f"*{ext}"
-            fasta_files = list(input_path.glob(pattern))
-            fasta_files.extend(input_path.glob(pattern.upper()))
-            
-            for fasta_file in fasta_files:
-                results = process_fasta_file(fasta_file, output_dir, args.model_seeds, args.split)
+        # Process all FASTA files in directory (one scan, case-insensitive extension match).
+        # Hidden files (e.g. macOS '._x.fasta' AppleDouble files) are skipped, as glob('*.fasta') did.
+        with os.scandir(input_path) as entries:
+            fasta_files = [Path(entry.path) for entry in entries
+                           if not entry.name.startswith('.')
+                           and entry.name.lower().endswith(extensions) and entry.is_file()]
+        
+        # Files are independent, so convert them in parallel.
+        # Reports are printed here in the parent, so output from different files never interleaves.
+        worker = functools.partial(process_fasta_file, output_dir=output_dir,
+                                   model_seeds=args.model_seeds, split_sequences=args.split)
+        workers = os.cpu_count() or 1
+        # Small enough chunks that every worker gets files, even for small directories
+        chunksize = min(16, max(1, len(fasta_files) // (4 * workers)))
+        with multiprocessing.Pool(processes=workers) as pool:
+            for results, report in pool.imap_unordered(worker, fasta_files, chunksize=chunksize):
+                print("\n".join(report))
                 processed_files.extend(results)
     
     else: